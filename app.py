@@ -4,22 +4,34 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
-from knowledge_base import (
-    HIGHEST_DEGREE_OPTIONS,
-    DEGREE_FIELD_OPTIONS,
-    STEM_COURSE_OPTIONS,
-    CERT_OPTIONS,
-    POSITIONS,
-    COURSE_WORK_EXAMPLES,
-    normalize_educations,
-    normalize_courses,
-    normalize_certs,
-)
 from evaluator import InferenceEngine
+from kb_registry import KnowledgeBaseRegistry
 
 
 st.set_page_config(page_title="Expert System Job Matcher", page_icon="🎯", layout="wide")
 
+
+@st.cache_resource
+def get_registry():
+    registry = KnowledgeBaseRegistry()
+    registry.start()
+    return registry
+
+
+# One snapshot per script run, so the form options, fact normalizers and
+# positions always come from the same knowledge-base version.
+kb = get_registry().current()
+
+HIGHEST_DEGREE_OPTIONS = kb.module.HIGHEST_DEGREE_OPTIONS
+DEGREE_FIELD_OPTIONS = kb.module.DEGREE_FIELD_OPTIONS
+STEM_COURSE_OPTIONS = kb.module.STEM_COURSE_OPTIONS
+CERT_OPTIONS = kb.module.CERT_OPTIONS
+COURSE_WORK_EXAMPLES = kb.module.COURSE_WORK_EXAMPLES
+normalize_educations = kb.module.normalize_educations
+normalize_courses = kb.module.normalize_courses
+normalize_certs = kb.module.normalize_certs
+
+
 # -------------------------
 # Session State
 # -------------------------
@@ -200,7 +212,7 @@ with right_col:
                 }
             )
 
-            results = st.session_state.engine.evaluate_with_trace(facts, POSITIONS)
+            results = st.session_state.engine.evaluate_with_trace(facts, kb.positions)
             st.session_state.results = results
             st.session_state.trace = st.session_state.engine.trace
             st.success("Evaluation complete.")
@@ -319,8 +331,7 @@ with right_col:
         # -------------------------
 
         with st.expander("View Inference Engine Trace"):
-            for line in st.session_state.trace:
-                st.text(line)
+            st.text("\n".join(st.session_state.trace))
 
         # -------------------------
         # Export
@@ -27,26 +27,28 @@ class PositionResult:
     total_match_pct: float
 
 
-def check_constraint(facts: Dict, field: str, op: str, expected: Any, message: str) -> RequirementCheck:
-    actual = facts.get(field)
-
+def constraint_passed(actual: Any, op: str, expected: Any) -> bool:
     if op == "bool":
-        passed = bool(actual) == bool(expected)
+        return bool(actual) == bool(expected)
     elif op == "min":
         try:
-            passed = float(actual) >= float(expected)
+            return float(actual) >= float(expected)
         except (TypeError, ValueError):
-            passed = False
+            return False
     elif op == "max":
         try:
-            passed = float(actual) <= float(expected)
+            return float(actual) <= float(expected)
         except (TypeError, ValueError):
-            passed = False
+            return False
     else:
-        passed = False
+        return False
+
+
+def check_constraint(facts: Dict, field: str, op: str, expected: Any, message: str) -> RequirementCheck:
+    actual = facts.get(field)
 
     return RequirementCheck(
-        passed=passed,
+        passed=constraint_passed(actual, op, expected),
         message=message,
         expected=expected,
         actual=actual,
@@ -95,8 +97,9 @@ def evaluate_all(facts: Dict, positions: List[Dict]) -> List[PositionResult]:
 
 
 class InferenceEngine:
-    def __init__(self):
+    def __init__(self, trace_store=None):
         self.trace = []
+        self.trace_store = trace_store
 
     def reset_trace(self):
         self.trace = []
@@ -104,6 +107,21 @@ class InferenceEngine:
     def evaluate_with_trace(self, facts: Dict, positions: List[Dict]) -> List[PositionResult]:
         self.reset_trace()
 
+        results = evaluate_all(facts, positions)
+
+        if self.trace_store is None:
+            self.build_trace(facts, positions)
+            return results
+
+        # Only format the trace when the store is going to keep it.
+        reason = self.trace_store.should_keep(facts, results)
+        if reason is not None:
+            self.build_trace(facts, positions)
+            self.trace_store.add(facts, self.trace, reason)
+
+        return results
+
+    def build_trace(self, facts: Dict, positions: List[Dict]):
         self.trace.append("=" * 60)
         self.trace.append("INFERENCE ENGINE TRACE")
         self.trace.append("=" * 60)
@@ -128,6 +146,4 @@ class InferenceEngine:
                     status = "MET" if check.passed else "NOT MET"
                     self.trace.append(f"  {status} | {msg} | expected={val} op={op} actual={facts.get(field)}")
 
-        self.trace.append("=" * 60)
-
-        return evaluate_all(facts, positions)
\ No newline at end of file
+        self.trace.append("=" * 60)
\ No newline at end of file
@@ -0,0 +1,198 @@
+# impact.py
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+
+from evaluator import constraint_passed
+
+
+Constraint = Tuple[str, str, Any, str]
+
+
+@dataclass
+class PositionChange:
+    name: str
+    status: str
+    required_added: List[Constraint]
+    required_removed: List[Constraint]
+    desired_added: List[Constraint]
+    desired_removed: List[Constraint]
+
+
+@dataclass
+class CandidateImpact:
+    candidate_ids: List[Any]
+    position: str
+    old_qualified: Optional[bool]
+    new_qualified: Optional[bool]
+    old_required_match_pct: Optional[float]
+    new_required_match_pct: Optional[float]
+    old_desired_match_pct: Optional[float]
+    new_desired_match_pct: Optional[float]
+    old_total_match_pct: Optional[float]
+    new_total_match_pct: Optional[float]
+
+
+def _pct(passed: int, total: int) -> float:
+    return (passed / total) * 100 if total else 0.0
+
+
+def _split(old: List[Constraint], new: List[Constraint]):
+    old_counts = Counter(old)
+    new_counts = Counter(new)
+    common = list((old_counts & new_counts).elements())
+    removed = list((old_counts - new_counts).elements())
+    added = list((new_counts - old_counts).elements())
+    return common, removed, added
+
+
+def diff_knowledge_bases(old_positions: List[Dict], new_positions: List[Dict]) -> List[PositionChange]:
+    old_by_name = {p["name"]: p for p in old_positions}
+    new_by_name = {p["name"]: p for p in new_positions}
+
+    changes = []
+
+    for name, old in old_by_name.items():
+        new = new_by_name.get(name)
+        if new is None:
+            changes.append(PositionChange(
+                name=name,
+                status="removed",
+                required_added=[],
+                required_removed=list(old.get("required", [])),
+                desired_added=[],
+                desired_removed=list(old.get("desired", [])),
+            ))
+            continue
+
+        _, req_removed, req_added = _split(old.get("required", []), new.get("required", []))
+        _, des_removed, des_added = _split(old.get("desired", []), new.get("desired", []))
+
+        if req_removed or req_added or des_removed or des_added:
+            changes.append(PositionChange(
+                name=name,
+                status="modified",
+                required_added=req_added,
+                required_removed=req_removed,
+                desired_added=des_added,
+                desired_removed=des_removed,
+            ))
+
+    for name, new in new_by_name.items():
+        if name not in old_by_name:
+            changes.append(PositionChange(
+                name=name,
+                status="added",
+                required_added=list(new.get("required", [])),
+                required_removed=[],
+                desired_added=list(new.get("desired", [])),
+                desired_removed=[],
+            ))
+
+    return changes
+
+
+def _count_passed(facts: Dict, constraints: List[Constraint]) -> int:
+    return sum(1 for (field, op, val, _) in constraints if constraint_passed(facts.get(field), op, val))
+
+
+def _score(facts: Dict, required: List[Constraint], desired: List[Constraint]):
+    req_passed = _count_passed(facts, required)
+    des_passed = _count_passed(facts, desired)
+    return (
+        req_passed == len(required),
+        _pct(req_passed, len(required)),
+        _pct(des_passed, len(desired)),
+        _pct(req_passed + des_passed, len(required) + len(desired)),
+    )
+
+
+def _group_by_fields(candidates: Dict[Any, Dict], fields: List[str]) -> List[Tuple[Dict, List[Any]]]:
+    """Bucket candidates by the values they hold for ``fields``.
+
+    Every candidate in a bucket scores the same on constraints over those
+    fields, so each bucket only needs to be evaluated once.
+    """
+    groups = {}
+    for candidate_id, facts in candidates.items():
+        key = tuple(map(facts.get, fields))
+        try:
+            group = groups.get(key)
+        except TypeError:
+            key = repr(key)
+            group = groups.get(key)
+        if group is None:
+            groups[key] = (facts, [candidate_id])
+        else:
+            group[1].append(candidate_id)
+    return list(groups.values())
+
+
+def analyze_impact(
+    old_positions: List[Dict],
+    new_positions: List[Dict],
+    candidates: Dict[Any, Dict],
+) -> List[CandidateImpact]:
+    """Report candidates whose status or match percentages differ between two
+    knowledge-base versions.
+
+    Only positions that changed are looked at. Candidates are grouped by the
+    facts the changed position reads, and each distinct combination is scored
+    once against both versions. Candidates that moved the same way are
+    reported together in one ``CandidateImpact``.
+    """
+    old_by_name = {p["name"]: p for p in old_positions}
+    new_by_name = {p["name"]: p for p in new_positions}
+
+    impacts = []
+
+    for change in diff_knowledge_bases(old_positions, new_positions):
+        by_outcome = {}
+        old = old_by_name.get(change.name, {})
+        new = new_by_name.get(change.name, {})
+
+        old_required = old.get("required", [])
+        old_desired = old.get("desired", [])
+        new_required = new.get("required", [])
+        new_desired = new.get("desired", [])
+
+        fields = list(dict.fromkeys(
+            c[0] for c in old_required + old_desired + new_required + new_desired
+        ))
+
+        for facts, candidate_ids in _group_by_fields(candidates, fields):
+            if change.status == "added":
+                old_result = (None, None, None, None)
+            else:
+                old_result = _score(facts, old_required, old_desired)
+
+            if change.status == "removed":
+                new_result = (None, None, None, None)
+            else:
+                new_result = _score(facts, new_required, new_desired)
+
+            if old_result == new_result:
+                continue
+
+            impact = by_outcome.get((old_result, new_result))
+            if impact is None:
+                by_outcome[(old_result, new_result)] = CandidateImpact(
+                    candidate_ids=list(candidate_ids),
+                    position=change.name,
+                    old_qualified=old_result[0],
+                    new_qualified=new_result[0],
+                    old_required_match_pct=old_result[1],
+                    new_required_match_pct=new_result[1],
+                    old_desired_match_pct=old_result[2],
+                    new_desired_match_pct=new_result[2],
+                    old_total_match_pct=old_result[3],
+                    new_total_match_pct=new_result[3],
+                )
+            else:
+                impact.candidate_ids.extend(candidate_ids)
+
+        impacts.extend(by_outcome.values())
+
+    return impacts
+
@@ -0,0 +1,175 @@
+# kb_registry.py
+
+import hashlib
+import importlib.util
+import os
+import threading
+from dataclasses import dataclass
+from types import ModuleType
+from typing import List, Dict, Any, Callable, Optional
+
+
+DEFAULT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "knowledge_base.py")
+
+
+@dataclass(frozen=True)
+class KnowledgeBaseVersion:
+    version: str
+    source: str
+    module: ModuleType
+    positions: List[Dict]
+
+
+def load_version(source: str) -> KnowledgeBaseVersion:
+    with open(source, "rb") as f:
+        code = f.read()
+
+    version = hashlib.sha256(code).hexdigest()
+
+    # Load under a version-specific name so the module imported by the rest of
+    # the app is left untouched and older versions stay usable.
+    spec = importlib.util.spec_from_file_location(f"knowledge_base_{version[:12]}", source)
+    module = importlib.util.module_from_spec(spec)
+    exec(compile(code, source, "exec"), module.__dict__)
+
+    positions = getattr(module, "POSITIONS", None)
+    if not isinstance(positions, list):
+        raise ValueError(f"{source} does not define a POSITIONS list")
+
+    return KnowledgeBaseVersion(
+        version=version,
+        source=source,
+        module=module,
+        positions=positions,
+    )
+
+
+class VersionedCache:
+    """Result cache keyed on (knowledge-base version, key).
+
+    Once ``retain`` has pinned a version, entries for any other version are
+    dropped and later ``put`` calls for them are ignored, so an evaluation that
+    finishes after a swap cannot leave a stale result behind.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self, version: str, key: Any, default: Any = None) -> Any:
+        return self._entries.get((version, key), default)
+
+    def put(self, version: str, key: Any, value: Any):
+        with self._lock:
+            if self._version is not None and version != self._version:
+                return
+            self._entries[(version, key)] = value
+
+    def retain(self, version: str):
+        with self._lock:
+            self._version = version
+            self._entries = {k: v for k, v in self._entries.items() if k[0] == version}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class KnowledgeBaseRegistry:
+    """Holds the live knowledge-base version and swaps in new ones on edit.
+
+    Callers take a snapshot with ``current()`` at the start of an evaluation
+    and use it throughout, so a reload never changes the rules underneath a
+    running evaluation. Reading the snapshot is a plain attribute access; the
+    file is polled and recompiled on a background thread.
+    """
+
+    def __init__(self, source: str = DEFAULT_SOURCE, poll_interval: float = 1.0):
+        self.source = source
+        self.poll_interval = poll_interval
+        self.last_error: Optional[Exception] = None
+
+        self._current = load_version(source)
+        self._mtime = self._stat()
+        self._listeners: List[Callable[[KnowledgeBaseVersion, KnowledgeBaseVersion], None]] = []
+        self._caches: List[VersionedCache] = []
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def current(self) -> KnowledgeBaseVersion:
+        return self._current
+
+    def on_swap(self, callback: Callable[[KnowledgeBaseVersion, KnowledgeBaseVersion], None]):
+        self._listeners.append(callback)
+
+    def register_cache(self, cache: VersionedCache):
+        cache.retain(self._current.version)
+        self._caches.append(cache)
+
+    def _stat(self):
+        try:
+            return os.stat(self.source).st_mtime_ns
+        except OSError:
+            return None
+
+    def reload(self) -> bool:
+        """Recompile the source and swap it in. Returns True if the version changed.
+
+        A source that fails to load leaves the current version in place and is
+        recorded in ``last_error``. So is an exception from a cache or an
+        ``on_swap`` callback; the remaining ones still run.
+        """
+        with self._reload_lock:
+            self._mtime = self._stat()
+            try:
+                new = load_version(self.source)
+            except Exception as e:
+                self.last_error = e
+                return False
+
+            self.last_error = None
+            old = self._current
+            if new.version == old.version:
+                return False
+
+            self._current = new
+
+            for cache in self._caches:
+                try:
+                    cache.retain(new.version)
+                except Exception as e:
+                    self.last_error = e
+            for callback in self._listeners:
+                try:
+                    callback(old, new)
+                except Exception as e:
+                    self.last_error = e
+
+            return True
+
+    def check(self) -> bool:
+        if self._stat() == self._mtime:
+            return False
+        return self.reload()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            # Keep polling whatever happens, or hot reload silently stops.
+            try:
+                self.check()
+            except Exception as e:
+                self.last_error = e
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="kb-registry-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
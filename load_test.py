@@ -0,0 +1,328 @@
+# load_test.py
+
+"""Load test for the scoring path and the Streamlit app.
+
+Replays random form submissions at a fixed number of concurrent sessions and
+reports throughput, latency percentiles and memory per session.
+
+    python load_test.py engine --sessions 50 --requests 200
+    python load_test.py app --sessions 8 --requests 20
+
+``engine`` drives ``InferenceEngine`` directly, one thread per session.
+``app`` runs ``app.py`` through Streamlit's ``AppTest`` harness, so every
+request pays for a full script rerun and element-tree build. ``AppTest`` does
+not go through the Streamlit server: websocket delivery, browser rendering
+and the server's per-session bookkeeping are not included, so app-mode
+throughput and memory per session understate what a served app costs. Use it
+to catch regressions in script and evaluation cost, not to size servers.
+``AppTest`` shares a process-wide runtime between instances, so app sessions
+each get their own worker process.
+
+Both modes score the same facts for a given workload. App sessions first
+reshape the form (degree entries, "Other" text inputs) with untimed reruns;
+only the evaluation rerun counts towards latency. Throughput is successful
+submissions per second of wall time, reruns included.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Callable
+
+from knowledge_base import (
+    HIGHEST_DEGREE_OPTIONS,
+    DEGREE_FIELD_OPTIONS,
+    STEM_COURSE_OPTIONS,
+    CERT_OPTIONS,
+    POSITIONS,
+    normalize_educations,
+    normalize_courses,
+    normalize_certs,
+)
+from evaluator import InferenceEngine
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Form field -> slider label in app.py
+SLIDERS = {
+    "python_years": "Python Development (years)",
+    "data_years": "Data Development (years)",
+    "expert_systems_years": "Expert Systems Development (years)",
+    "project_mgmt_years": "Managing Software Projects (years)",
+    "agile_years": "Agile Projects Experience (years)",
+    "data_architecture_years": "Data Architecture and Development (years)",
+}
+
+TOGGLES = {
+    "has_git": "Used Git",
+    "agile_projects": "Experience in Agile projects",
+}
+
+
+def random_submission(rng: random.Random) -> Dict:
+    courses = rng.sample(STEM_COURSE_OPTIONS, rng.randint(0, 8))
+    certs = rng.sample(CERT_OPTIONS, rng.randint(0, 3))
+
+    form = {
+        "first_name": "Load",
+        "last_name": f"Test{rng.randint(0, 999999)}",
+        "educations": [
+            {
+                "highest_degree": rng.choice(HIGHEST_DEGREE_OPTIONS),
+                "degree_field": rng.choice(DEGREE_FIELD_OPTIONS),
+            }
+            for _ in range(rng.randint(1, 3))
+        ],
+        "courses": courses,
+        "courses_other": "Kanban Workshop, Python for Data" if "Other" in courses else "",
+        "certs": certs,
+        "certs_other": "PMI Lean" if "Other" in certs else "",
+    }
+    form.update({field: rng.randint(0, 20) for field in SLIDERS})
+    form.update({field: rng.random() < 0.5 for field in TOGGLES})
+    return form
+
+
+def build_facts(form: Dict) -> Dict:
+    # Mirrors the fact assembly in app.py.
+    facts = {
+        "first_name": form["first_name"],
+        "last_name": form["last_name"],
+    }
+    facts.update(normalize_educations(form["educations"]))
+    facts.update(normalize_courses(form["courses"], form["courses_other"]))
+    facts.update(normalize_certs(form["certs"], form["certs_other"]))
+    facts.update({field: form[field] for field in SLIDERS})
+    facts.update({field: form[field] for field in TOGGLES})
+    return facts
+
+
+# -------------------------
+# Sessions
+# -------------------------
+
+class EngineSession:
+    def __init__(self):
+        self.engine = InferenceEngine()
+        self.results = None
+
+    def prepare(self, form: Dict):
+        pass
+
+    def submit(self, form: Dict):
+        self.results = self.engine.evaluate_with_trace(build_facts(form), POSITIONS)
+
+
+class AppSession:
+    def __init__(self, timeout: float = 30.0):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self._run()
+
+    def _run(self):
+        # AppTest installs app.py as __main__; put ours back so the worker can
+        # still unpickle the next task.
+        main = sys.modules["__main__"]
+        try:
+            self.at.run()
+        finally:
+            sys.modules["__main__"] = main
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].message)
+
+    def _by_label(self, widgets, label):
+        for w in widgets:
+            if w.label == label:
+                return w
+        raise LookupError(f"No widget labelled {label!r}")
+
+    def _degree_count(self) -> int:
+        return sum(1 for w in self.at.selectbox if w.key and w.key.startswith("deg_level_"))
+
+    def _click(self, label: str):
+        self._by_label(self.at.button, label).click()
+        self._run()
+
+    def prepare(self, form: Dict):
+        """Make the form match ``form`` in shape: one entry per degree, and the
+        "Other" text inputs shown when "Other" is selected. Not timed."""
+        at = self.at
+
+        while self._degree_count() < len(form["educations"]):
+            self._click("Add Another Degree")
+        while self._degree_count() > len(form["educations"]):
+            self._click("Remove Last")
+
+        self._by_label(at.multiselect, "STEM Courses Completed").set_value(form["courses"])
+        self._by_label(at.multiselect, "Professional Certifications").set_value(form["certs"])
+        self._run()
+
+    def submit(self, form: Dict):
+        at = self.at
+
+        self._by_label(at.text_input, "First Name").input(form["first_name"])
+        self._by_label(at.text_input, "Last Name").input(form["last_name"])
+        for i, edu in enumerate(form["educations"]):
+            at.selectbox(key=f"deg_level_{i}").set_value(edu["highest_degree"])
+            at.selectbox(key=f"deg_field_{i}").set_value(edu["degree_field"])
+        if "Other" in form["courses"]:
+            self._by_label(at.text_input, "Other courses (comma separated)").input(form["courses_other"])
+        if "Other" in form["certs"]:
+            self._by_label(at.text_input, "Other certifications (comma separated)").input(form["certs_other"])
+        for field, label in SLIDERS.items():
+            self._by_label(at.slider, label).set_value(form[field])
+        for field, label in TOGGLES.items():
+            self._by_label(at.toggle, label).set_value(form[field])
+        self._by_label(at.button, "Evaluate Qualifications").click()
+
+        self._run()
+
+
+SESSION_TYPES: Dict[str, Callable] = {
+    "engine": EngineSession,
+    "app": AppSession,
+}
+
+EXECUTORS = {
+    "engine": ThreadPoolExecutor,
+    "app": ProcessPoolExecutor,
+}
+
+
+# -------------------------
+# Runner
+# -------------------------
+
+@dataclass
+class LoadTestReport:
+    mode: str
+    sessions: int
+    requests: int
+    errors: int
+    elapsed: float
+    latencies: List[float]
+    memory_per_session: int
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def format(self) -> str:
+        return "\n".join([
+            "=" * 60,
+            f"LOAD TEST: {self.mode}",
+            "=" * 60,
+            f"Sessions:            {self.sessions}",
+            f"Requests:            {self.requests} ok, {self.errors} failed",
+            f"Elapsed:             {self.elapsed:.2f} s",
+            f"Throughput:          {self.throughput:.1f} req/s (successful only)",
+            f"Latency p50:         {self.percentile(50) * 1000:.2f} ms",
+            f"Latency p95:         {self.percentile(95) * 1000:.2f} ms",
+            f"Latency p99:         {self.percentile(99) * 1000:.2f} ms",
+            f"Memory per session:  {self.memory_per_session / 1024:.1f} KiB",
+            "=" * 60,
+        ])
+
+
+def measure_session_memory(mode: str, forms: List[Dict]) -> int:
+    """Bytes still held by one session after it has served ``forms``.
+
+    Measured on a separate session so tracemalloc overhead stays out of the
+    latency figures. A throwaway session is served first so module imports
+    and one-off caches are not counted.
+    """
+    warmup = SESSION_TYPES[mode]()
+    warmup.prepare(forms[0])
+    warmup.submit(forms[0])
+    del warmup
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        session = SESSION_TYPES[mode]()
+        for form in forms:
+            session.prepare(form)
+            session.submit(form)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return max(0, after - before)
+
+
+def run_session(mode: str, forms: List[Dict]):
+    latencies = []
+    errors = 0
+    session = SESSION_TYPES[mode]()
+    # Wall-clock window of the submissions, comparable across processes.
+    began = time.time()
+    for form in forms:
+        try:
+            session.prepare(form)
+            start = time.perf_counter()
+            session.submit(form)
+        except Exception:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors, began, time.time()
+
+
+def run_load_test(mode: str, sessions: int, requests_per_session: int, seed: int = 0) -> LoadTestReport:
+    rng = random.Random(seed)
+    workloads = [
+        [random_submission(rng) for _ in range(requests_per_session)]
+        for _ in range(sessions)
+    ]
+
+    with EXECUTORS[mode](max_workers=sessions) as pool:
+        # Run in the pool too, so an app session never touches this process.
+        memory_per_session = pool.submit(measure_session_memory, mode, workloads[0]).result()
+
+        outcomes = list(pool.map(run_session, [mode] * sessions, workloads))
+
+    elapsed = max(o[3] for o in outcomes) - min(o[2] for o in outcomes)
+
+    return LoadTestReport(
+        mode=mode,
+        sessions=sessions,
+        requests=sum(len(o[0]) for o in outcomes),
+        errors=sum(o[1] for o in outcomes),
+        elapsed=elapsed,
+        latencies=[lat for o in outcomes for lat in o[0]],
+        memory_per_session=memory_per_session,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the job matcher.")
+    parser.add_argument("mode", choices=sorted(SESSION_TYPES), help="engine: in-process scoring, app: app.py via Streamlit")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent sessions")
+    parser.add_argument("--requests", type=int, default=50, help="form submissions per session")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.sessions < 1:
+        parser.error("--sessions must be at least 1")
+    if args.requests < 1:
+        parser.error("--requests must be at least 1")
+
+    report = run_load_test(args.mode, args.sessions, args.requests, args.seed)
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# test_impact.py
+
+import copy
+import random
+
+from knowledge_base import POSITIONS
+from evaluator import evaluate_all
+from impact import analyze_impact, diff_knowledge_bases
+
+
+NUMERIC = ["python_years", "data_years", "project_mgmt_years", "agile_years",
+           "expert_systems_years", "data_architecture_years"]
+BOOLEAN = ["agile_projects", "has_bachelors_cs", "has_masters_cs", "has_git", "has_pmi_lean",
+           "has_pmp", "python_coursework", "se_coursework", "agile_coursework"]
+
+
+def make_candidates(n, seed=0):
+    rng = random.Random(seed)
+    candidates = {}
+    for i in range(n):
+        facts = {f: rng.randint(0, 6) for f in NUMERIC}
+        facts.update({f: rng.random() < 0.7 for f in BOOLEAN})
+        candidates[i] = facts
+    return candidates
+
+
+def outcome(result):
+    if result is None:
+        return None
+    return (result.qualified, result.required_match_pct, result.desired_match_pct, result.total_match_pct)
+
+
+def brute_force(old_positions, new_positions, candidates):
+    expected = set()
+    for candidate_id, facts in candidates.items():
+        old = {r.name: r for r in evaluate_all(facts, old_positions)}
+        new = {r.name: r for r in evaluate_all(facts, new_positions)}
+        for name in set(old) | set(new):
+            before, after = outcome(old.get(name)), outcome(new.get(name))
+            if before != after:
+                expected.add((candidate_id, name, before, after))
+    return expected
+
+
+def flatten(impacts):
+    got = set()
+    for impact in impacts:
+        before = None if impact.old_qualified is None else (
+            impact.old_qualified, impact.old_required_match_pct,
+            impact.old_desired_match_pct, impact.old_total_match_pct)
+        after = None if impact.new_qualified is None else (
+            impact.new_qualified, impact.new_required_match_pct,
+            impact.new_desired_match_pct, impact.new_total_match_pct)
+        for candidate_id in impact.candidate_ids:
+            got.add((candidate_id, impact.position, before, after))
+    return got
+
+
+def edited(edit):
+    positions = copy.deepcopy(POSITIONS)
+    edit(positions)
+    return positions
+
+
+EDITS = {
+    "raise threshold": lambda p: p[1]["required"].__setitem__(
+        0, ("python_years", "min", 4, "At least 4 years Python development is required")),
+    "add desired": lambda p: p[2]["desired"].append(("has_pmp", "bool", True, "PMP is desired")),
+    "remove required": lambda p: p[2]["required"].pop(),
+    "add position": lambda p: p.append({"name": "Git User", "required": [("has_git", "bool", True, "Git")]}),
+    "remove position": lambda p: p.pop(3),
+}
+
+
+def test_analyze_impact_matches_full_rescreen():
+    candidates = make_candidates(3000)
+    for name, edit in EDITS.items():
+        new_positions = edited(edit)
+        assert flatten(analyze_impact(POSITIONS, new_positions, candidates)) == \
+            brute_force(POSITIONS, new_positions, candidates), name
+
+
+def test_analyze_impact_handles_unhashable_fact_values():
+    candidates = make_candidates(200, seed=1)
+    for facts in candidates.values():
+        facts["certs_selected"] = ["PMP"] if facts["has_pmp"] else []
+    new_positions = edited(lambda p: p[2]["desired"].append(
+        ("certs_selected", "bool", True, "Any certification is desired")))
+    assert flatten(analyze_impact(POSITIONS, new_positions, candidates)) == \
+        brute_force(POSITIONS, new_positions, candidates)
+
+
+def test_unchanged_knowledge_base_has_no_impact():
+    assert diff_knowledge_bases(POSITIONS, copy.deepcopy(POSITIONS)) == []
+    assert analyze_impact(POSITIONS, copy.deepcopy(POSITIONS), make_candidates(100)) == []
+
+
+def test_diff_reports_constraint_level_changes():
+    new_positions = edited(EDITS["raise threshold"])
+    [change] = diff_knowledge_bases(POSITIONS, new_positions)
+    assert change.name == "Python Engineer"
+    assert change.status == "modified"
+    assert [c[2] for c in change.required_removed] == [3]
+    assert [c[2] for c in change.required_added] == [4]
+    assert change.desired_added == change.desired_removed == []
@@ -0,0 +1,127 @@
+# test_kb_registry.py
+
+import os
+import shutil
+import threading
+
+from kb_registry import DEFAULT_SOURCE, KnowledgeBaseRegistry, VersionedCache
+
+
+def copy_source(tmp_path):
+    source = str(tmp_path / "knowledge_base.py")
+    shutil.copy(DEFAULT_SOURCE, source)
+    return source
+
+
+def raise_python_threshold(source):
+    with open(source) as f:
+        code = f.read()
+    with open(source, "w") as f:
+        f.write(code.replace('("python_years", "min", 3,', '("python_years", "min", 4,'))
+
+
+def test_reload_swaps_in_new_version_and_keeps_old_snapshot(tmp_path):
+    source = copy_source(tmp_path)
+    registry = KnowledgeBaseRegistry(source)
+    old = registry.current()
+
+    raise_python_threshold(source)
+    assert registry.reload()
+
+    new = registry.current()
+    assert new.version != old.version
+    assert new.positions[1]["required"][0][2] == 4
+    assert old.positions[1]["required"][0][2] == 3
+
+
+def test_reload_with_bad_source_keeps_current_version(tmp_path):
+    source = copy_source(tmp_path)
+    registry = KnowledgeBaseRegistry(source)
+    current = registry.current()
+
+    with open(source, "w") as f:
+        f.write("POSITIONS = [")
+    assert not registry.reload()
+    assert registry.current() is current
+    assert isinstance(registry.last_error, SyntaxError)
+
+    with open(source, "w") as f:
+        f.write("POSITIONS = None\n")
+    assert not registry.reload()
+    assert registry.current() is current
+    assert isinstance(registry.last_error, ValueError)
+
+
+def test_failing_callback_does_not_stop_other_listeners_or_caches(tmp_path):
+    source = copy_source(tmp_path)
+    registry = KnowledgeBaseRegistry(source)
+    seen = []
+
+    def broken(old, new):
+        raise RuntimeError("boom")
+
+    registry.on_swap(broken)
+    registry.on_swap(lambda old, new: seen.append(new.version))
+    cache = VersionedCache()
+    registry.register_cache(cache)
+    old_version = registry.current().version
+    cache.put(old_version, "a", 1)
+
+    raise_python_threshold(source)
+    assert registry.reload()
+
+    assert seen == [registry.current().version]
+    assert str(registry.last_error) == "boom"
+    assert len(cache) == 0
+
+
+def test_cache_ignores_late_writes_for_replaced_version(tmp_path):
+    source = copy_source(tmp_path)
+    registry = KnowledgeBaseRegistry(source)
+    cache = VersionedCache()
+    registry.register_cache(cache)
+    old_version = registry.current().version
+
+    raise_python_threshold(source)
+    registry.reload()
+    new_version = registry.current().version
+
+    cache.put(old_version, "late", 1)
+    cache.put(new_version, "fresh", 2)
+    assert cache.get(old_version, "late") is None
+    assert cache.get(new_version, "fresh") == 2
+    assert len(cache) == 1
+
+
+def test_check_only_reloads_when_file_changes(tmp_path):
+    source = copy_source(tmp_path)
+    registry = KnowledgeBaseRegistry(source)
+    assert not registry.check()
+
+    raise_python_threshold(source)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert registry.check()
+
+
+def test_watcher_survives_an_exception(tmp_path):
+    source = copy_source(tmp_path)
+    registry = KnowledgeBaseRegistry(source, poll_interval=0.01)
+    polled = threading.Event()
+    calls = []
+
+    def check():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        polled.set()
+        return False
+
+    registry.check = check
+    registry.start()
+    try:
+        assert polled.wait(5)
+        assert registry._thread.is_alive()
+        assert str(registry.last_error) == "boom"
+    finally:
+        registry.stop()
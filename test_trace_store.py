@@ -0,0 +1,139 @@
+# test_trace_store.py
+
+import functools
+import gzip
+import os
+import random
+import subprocess
+import sys
+
+from knowledge_base import (
+    HIGHEST_DEGREE_OPTIONS,
+    DEGREE_FIELD_OPTIONS,
+    STEM_COURSE_OPTIONS,
+    CERT_OPTIONS,
+    POSITIONS,
+    normalize_educations,
+    normalize_courses,
+    normalize_certs,
+)
+from evaluator import InferenceEngine, evaluate_all
+from trace_store import TraceStore, near_miss, read_traces
+
+
+def realistic_facts(rng):
+    facts = {}
+    facts.update(normalize_educations([
+        {"highest_degree": rng.choice(HIGHEST_DEGREE_OPTIONS), "degree_field": rng.choice(DEGREE_FIELD_OPTIONS)}
+        for _ in range(rng.randint(1, 3))
+    ]))
+    facts.update(normalize_courses(rng.sample(STEM_COURSE_OPTIONS, rng.randint(0, 8)), ""))
+    facts.update(normalize_certs(rng.sample(CERT_OPTIONS, rng.randint(0, 3)), ""))
+    for field in ["python_years", "data_years", "expert_systems_years",
+                  "project_mgmt_years", "agile_years", "data_architecture_years"]:
+        facts[field] = rng.randint(0, 20)
+    facts["has_git"] = rng.random() < 0.5
+    facts["agile_projects"] = rng.random() < 0.5
+    return facts
+
+
+def test_default_store_keeps_roughly_the_sample_rate():
+    rng = random.Random(0)
+    store = TraceStore(capacity=10, sample_rate=0.01, rng=random.Random(1))
+    engine = InferenceEngine(trace_store=store)
+    kept = 0
+    for _ in range(20000):
+        engine.evaluate_with_trace(realistic_facts(rng), POSITIONS)
+        kept += bool(engine.trace)
+    # 200 expected; allow about four standard deviations either way.
+    assert 140 <= kept <= 260
+    assert len(store) == 10
+
+
+def test_keep_budget_caps_always_keep_rules():
+    rng = random.Random(0)
+    store = TraceStore(sample_rate=0.0, keep_rules=[near_miss], keep_budget=25)
+    engine = InferenceEngine(trace_store=store)
+    for _ in range(2000):
+        engine.evaluate_with_trace(realistic_facts(rng), POSITIONS)
+    assert len(store) == 25
+    assert {r.reason for r in store.recent()} == {"near_miss"}
+
+
+def test_keep_rule_names():
+    facts = realistic_facts(random.Random(0))
+    results = evaluate_all(facts, POSITIONS)
+    always = functools.partial(lambda f, r, answer: answer, answer=True)
+    assert TraceStore(keep_rules=[always]).should_keep(facts, results) == repr(always)
+    assert TraceStore(keep_rules=[("custom", always)]).should_keep(facts, results) == "custom"
+
+
+def test_records_hold_a_copy_of_the_facts():
+    store = TraceStore()
+    facts = {"python_years": 3, "educations": [{"degree_field": "Computer Science"}]}
+    store.add(facts, ["line"], "manual")
+    facts["python_years"] = 99
+    facts["educations"][0]["degree_field"] = "Other"
+    record = store.recent()[0]
+    assert record.facts == {"python_years": 3, "educations": [{"degree_field": "Computer Science"}]}
+
+
+def test_spill_round_trip(tmp_path):
+    path = str(tmp_path / "traces.jsonl.gz")
+    with TraceStore(spill_path=path) as store:
+        for i in range(5):
+            store.add({"i": i}, [f"line {i}"], "sampled")
+    records = list(read_traces(path))
+    assert [r.facts["i"] for r in records] == list(range(5))
+    assert records[0].trace == ["line 0"]
+
+
+def test_spill_compresses_as_one_stream(tmp_path):
+    path = str(tmp_path / "traces.jsonl.gz")
+    rng = random.Random(0)
+    store = TraceStore(sample_rate=1.0, spill_path=path)
+    engine = InferenceEngine(trace_store=store)
+    raw = 0
+    for _ in range(500):
+        engine.evaluate_with_trace(realistic_facts(rng), POSITIONS)
+        raw += sum(len(line) + 1 for line in engine.trace)
+    store.close()
+    assert os.path.getsize(path) < raw / 10
+
+
+def test_reopen_after_flushed_but_unclosed_store(tmp_path):
+    path = str(tmp_path / "traces.jsonl.gz")
+    # Flush, then die without closing, as a crashed batch run would.
+    script = (
+        "import os, sys\n"
+        f"sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r})\n"
+        "from trace_store import TraceStore\n"
+        f"store = TraceStore(spill_path={path!r})\n"
+        "for i in range(3):\n"
+        "    store.add({'i': i}, ['x'], 'sampled')\n"
+        "store.flush()\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+    store = TraceStore(spill_path=path)
+    store.add({"i": 3}, ["x"], "sampled")
+    store.close()
+
+    assert [r.facts["i"] for r in read_traces(path)] == [0, 1, 2, 3]
+
+
+def test_damaged_tail_keeps_earlier_records(tmp_path):
+    path = str(tmp_path / "traces.jsonl.gz")
+    with TraceStore(spill_path=path) as store:
+        for i in range(3):
+            store.add({"i": i}, ["x"], "sampled")
+
+    # A member cut off mid-write, followed by a good one appended later.
+    partial = gzip.compress(b'{"timestamp": 0, "reason": "x", "facts": {}, "trace": []}\n' * 50)
+    with open(path, "ab") as f:
+        f.write(partial[: len(partial) // 2])
+    with TraceStore(spill_path=path) as store:
+        store.add({"i": 99}, ["x"], "sampled")
+
+    assert [r.facts["i"] for r in read_traces(path)] == [0, 1, 2]
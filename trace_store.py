@@ -0,0 +1,178 @@
+# trace_store.py
+
+import copy
+import gzip
+import json
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Callable, Iterator, Optional, Tuple, Union
+
+
+@dataclass
+class TraceRecord:
+    timestamp: float
+    reason: str
+    facts: Dict
+    trace: List[str]
+
+
+KeepRule = Callable[[Dict, List], bool]
+
+
+def near_miss(facts: Dict, results: List) -> bool:
+    """True when some position failed on exactly one required rule."""
+    return any(len(r.required_failed) == 1 for r in results)
+
+
+def _rule_name(rule: KeepRule) -> str:
+    return getattr(rule, "__name__", repr(rule))
+
+
+class TraceStore:
+    """Decides which traces to keep and holds the most recent ones.
+
+    Traces are kept with probability ``sample_rate``. ``keep_rules`` are
+    opt-in predicates (such as ``near_miss``), given either as callables or as
+    ``(name, predicate)`` pairs, whose matches are always kept until
+    ``keep_budget`` of them have been taken; after that they are sampled like
+    everything else. Kept traces go into a ring buffer of ``capacity`` records
+    and, if ``spill_path`` is set, are appended to that file as gzip members.
+    ``flush`` and ``close`` finish the current member, so a crash can only
+    lose records added since the last flush.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        sample_rate: float = 0.0,
+        keep_rules: Optional[List[Union[KeepRule, Tuple[str, KeepRule]]]] = None,
+        keep_budget: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        self.sample_rate = sample_rate
+        self.keep_rules = [
+            rule if isinstance(rule, tuple) else (_rule_name(rule), rule)
+            for rule in (keep_rules or [])
+        ]
+        self.keep_budget = keep_budget
+        self.spill_path = spill_path
+        self._kept_by_rule = 0
+        self._rng = rng or random.Random()
+        self._buffer = deque(maxlen=capacity)
+        self._spill = None
+        self._lock = threading.Lock()
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.keep_budget is not None and self._kept_by_rule >= self.keep_budget:
+                return False
+            self._kept_by_rule += 1
+            return True
+
+    def should_keep(self, facts: Dict, results: List) -> Optional[str]:
+        for name, rule in self.keep_rules:
+            if rule(facts, results) and self._take_budget():
+                return name
+        if self.sample_rate > 0 and self._rng.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def add(self, facts: Dict, trace: List[str], reason: str) -> TraceRecord:
+        record = TraceRecord(
+            timestamp=time.time(),
+            reason=reason,
+            facts=copy.deepcopy(facts),
+            trace=list(trace),
+        )
+
+        with self._lock:
+            self._buffer.append(record)
+            if self.spill_path:
+                if self._spill is None:
+                    self._spill = gzip.open(self.spill_path, "ab")
+                line = json.dumps(asdict(record), default=str) + "\n"
+                self._spill.write(line.encode("utf-8"))
+
+        return record
+
+    def flush(self):
+        # Closing writes the gzip trailer; the next add() starts a new member.
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def recent(self) -> List[TraceRecord]:
+        with self._lock:
+            return list(self._buffer)
+
+    def __len__(self):
+        return len(self._buffer)
+
+
+def _decompress(decomp, data: bytes):
+    """Feed ``data`` to ``decomp``, returning (decomp, output, ok).
+
+    On corrupt input, narrow down to the bad byte so every record before the
+    damage is still recovered.
+    """
+    backup = decomp.copy()
+    try:
+        return decomp, decomp.decompress(data), True
+    except zlib.error:
+        if len(data) <= 1:
+            return backup, b"", False
+    half = len(data) // 2
+    decomp, head, ok = _decompress(backup, data[:half])
+    if not ok:
+        return decomp, head, False
+    decomp, tail, ok = _decompress(decomp, data[half:])
+    return decomp, head + tail, ok
+
+
+def _spilled_lines(path: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    decomp = zlib.decompressobj(wbits=31)
+    pending = b""
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                return
+            while data:
+                decomp, out, ok = _decompress(decomp, data)
+                lines = (pending + out).split(b"\n")
+                pending = lines.pop()
+                yield from lines
+                if not ok:
+                    return
+                if decomp.eof:
+                    # End of one member; anything left over starts the next.
+                    data = decomp.unused_data
+                    decomp = zlib.decompressobj(wbits=31)
+                else:
+                    data = b""
+
+
+def read_traces(path: str) -> Iterator[TraceRecord]:
+    """Yield spilled records in order.
+
+    Reading stops at the first damaged or truncated member, such as one left
+    by a crash mid-write; records before it are still returned.
+    """
+    for line in _spilled_lines(path):
+        if line.strip():
+            yield TraceRecord(**json.loads(line))